@@ -0,0 +1,47 @@
+import OMPython
+import pathlib
+import sys
+import pytest
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / "workshop"))
+from _matresult import load_mat, read_mat_result  # noqa: E402
+
+
+@pytest.fixture
+def model_aliases(tmp_path):
+    mod = tmp_path / "M.mo"
+    mod.write_text("""model M
+  Real x(start = 1, fixed = true);
+  Real y;
+  Real z;
+  parameter Real a = -1;
+equation
+  der(x) = x*a;
+  y = x;
+  z = -x;
+end M;
+""")
+    return mod
+
+
+def test_read_mat_result(model_aliases):
+    mod = OMPython.ModelicaSystem(model_aliases.as_posix(), "M")
+    mod.setSimulationOptions(simOptions={"stopTime": 1.0, "stepSize": 0.1})
+    mod.simulate()
+    result_file = mod.getWorkDirectory() / "M_res.mat"
+
+    # the model covers every storage layout of the result file
+    data_info = load_mat(result_file)['dataInfo']
+    assert (data_info[0] == 1).any(), "no variable in data_1"
+    assert (data_info[0] == 2).any(), "no variable in data_2"
+    assert (data_info[1] < 0).any(), "no negated alias"
+
+    names = ["time", "x", "der(x)", "y", "z"]
+    for name, values in zip(names, read_mat_result(result_file, names)):
+        expected = mod.getSolutions(name)[0]
+        assert np.allclose(values, expected), name
+
+    t, a = read_mat_result(result_file, ["time", "a"])
+    assert a.shape == t.shape
+    assert np.allclose(a, -1)
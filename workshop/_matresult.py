@@ -0,0 +1,81 @@
+"""
+Reader for OpenModelica result files (*_res.mat, MAT v4 format).
+
+Only needs numpy, so it can be used and tested without scipy or
+matplotlib; see explorer_base.py for the interactive explorers using it.
+"""
+
+import pathlib
+import struct
+
+import numpy as np
+
+# MAT v4 precision digit -> numpy type
+_DTYPES = {0: 'f8', 1: 'f4', 2: 'i4', 3: 'i2', 4: 'u2', 5: 'u1'}
+
+
+def load_mat(result_file):
+    """
+    Read all matrices of a MAT v4 file.
+
+    Returns:
+        Dict of 2D arrays (rows x columns, as stored by the writer); text
+        matrices are returned as uint8 arrays
+    """
+    data = pathlib.Path(result_file).read_bytes()
+    matrices = {}
+    pos = 0
+    while pos < len(data):
+        # the thousands digit of the type field is 0 for little-endian files
+        mopt, = struct.unpack_from('<i', data, pos)
+        order = '<' if 0 <= mopt < 1000 else '>'
+        mopt, mrows, ncols, _imagf, namlen = struct.unpack_from(order + '5i', data, pos)
+        pos += 20
+
+        name = data[pos:pos + namlen].rstrip(b'\x00').decode()
+        pos += namlen
+
+        dtype = np.dtype(_DTYPES[mopt // 10 % 10]).newbyteorder(order)
+        count = mrows * ncols
+        # stored column by column
+        matrices[name] = np.frombuffer(data, dtype, count, pos).reshape(ncols, mrows).T
+        pos += count * dtype.itemsize
+
+    return matrices
+
+
+def read_mat_result(result_file, names):
+    """
+    Read variables from an OpenModelica result file (MAT v4 format).
+
+    The file is parsed locally in one pass instead of asking OMC for each
+    variable via getSolutions(). tests/test_workshop_explorer.py checks it
+    against getSolutions() for states, parameters and (negated) aliases.
+
+    Args:
+        result_file: Path to the *_res.mat file
+        names: Variable names to extract
+
+    Returns:
+        List of 1D arrays, one per name
+    """
+    mat = load_mat(result_file)
+    # OpenModelica stores the matrices transposed ('binTrans'): one column per variable
+    var_names = [col.tobytes().rstrip(b'\x00 ').decode() for col in mat['name'].T]
+    data_info = mat['dataInfo']
+    data_2 = mat['data_2']
+
+    arrays = []
+    for name in names:
+        i = var_names.index(name)
+        col = data_info[1, i]
+        if data_info[0, i] == 1:
+            # parameters and constants are stored once in data_1
+            value = mat['data_1'][abs(col) - 1, 0]
+            values = np.full(data_2.shape[1], value, dtype=float)
+        else:
+            values = data_2[abs(col) - 1, :].astype(float)
+        # negative indices denote negated alias variables
+        arrays.append(-values if col < 0 else values)
+
+    return arrays
@@ -4,60 +4,63 @@ Interactive parameter explorer for Newton Cooling model.
 Allows real-time parameter adjustment and visualization.
 """
 
+import importlib.util
 import sys
 import pathlib
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
 import numpy as np
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
 
-from OMPython import ModelicaSystem
+# The explorer base (workshop/explorer_base.py) is shared by the workshops
+# and never installed, so unlike OMPython above it cannot be found any other
+# way: this path is always needed, and the script has to stay in the checkout
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 
+from explorer_base import ParameterExplorer, SliderSpec, fit_ylim
 
-class CoolingModelExplorer:
+# Text of the info box; formatted with the current parameters and results
+INFO_TEMPLATE = (
+    "Parameters: h={h:.3f}, m={m:.3f}, A={A:.3f}, T0={T0:.2f}K | "
+    "Final T={final_temp:.2f}K (drop: {temp_drop:.2f}K)"
+)
+
+
+class CoolingModelExplorer(ParameterExplorer):
     """Interactive explorer for Newton Cooling model parameters."""
 
     def __init__(self, model_file, model_name):
-        self.model_file = model_file
-        self.model_name = model_name
-
-        # Parameter ranges
-        self.param_ranges = {
-            'h': (0.1, 2.0, 0.7),    # (min, max, default)
-            'm': (0.01, 0.5, 0.1),
-            'A': (0.1, 3.0, 1.0),
-            'T0': (300, 400, 363.15),
-            'c_p': (0.5, 2.0, 1.2)
-        }
-
-        # Initial simulation
-        self.current_params = {k: v[2] for k, v in self.param_ranges.items()}
-        self.simulate()
-
-        # Create interactive plot
-        self.setup_interactive_plot()
-
-    def simulate(self):
-        """Run simulation with current parameters."""
-        mod = ModelicaSystem(
-            fileName=self.model_file,
-            modelName=self.model_name,
-            build=True
+        # Plot buffers, allocated on the first simulation and updated in place
+        self.temperature = self.ambient_temp = None
+
+        super().__init__(
+            model_file, model_name,
+            # Parameter ranges and sliders
+            specs={
+                'h': SliderSpec(0.1, 2.0, 0.7, 'Convection Coef. h', 1),
+                'm': SliderSpec(0.01, 0.5, 0.1, 'Mass m', 1),
+                'A': SliderSpec(0.1, 3.0, 1.0, 'Surface Area A', 1),
+                'T0': SliderSpec(300, 400, 363.15, 'Initial Temp T0', 1),
+                'c_p': SliderSpec(0.5, 2.0, 1.2, None, 1),
+            },
+            sim_options={
+                'stopTime': '2.0',
+                'stepSize': '0.01'
+            },
+            result_names=["T", "T_inf"]
         )
 
-        mod.setSimulationOptions({
-            'stopTime': '2.0',
-            'stepSize': '0.01'
-        })
-
-        mod.setParameters({k: str(v) for k, v in self.current_params.items()})
-        mod.simulate()
+    def _load(self, results):
+        """Copy a simulation result into the preallocated plot buffers."""
+        if self.temperature is None:
+            self.temperature, self.ambient_temp = (
+                np.empty_like(values) for values in results
+            )
 
-        self.time = mod.getSolutions("time")[0]
-        self.temperature = mod.getSolutions("T")[0]
-        self.ambient_temp = mod.getSolutions("T_inf")[0]
+        for buffer, values in zip((self.temperature, self.ambient_temp), results):
+            buffer[:] = values
 
     def setup_interactive_plot(self):
         """Create the interactive matplotlib figure with sliders."""
@@ -69,9 +72,11 @@ class CoolingModelExplorer:
         # Main plot
         self.ax_main = self.fig.add_subplot(gs[0, :])
         self.line_T, = self.ax_main.plot(self.time, self.temperature,
-                                          'b-', linewidth=2, label='Object Temperature')
+                                          'b-', linewidth=2, label='Object Temperature',
+                                          animated=True)
         self.line_Tinf, = self.ax_main.plot(self.time, self.ambient_temp,
-                                             'r--', linewidth=2, label='Ambient Temperature')
+                                             'r--', linewidth=2, label='Ambient Temperature',
+                                             animated=True)
 
         self.ax_main.set_xlabel('Time (s)', fontsize=12)
         self.ax_main.set_ylabel('Temperature (K)', fontsize=12)
@@ -80,67 +85,33 @@ class CoolingModelExplorer:
         self.ax_main.legend(fontsize=11)
         self.ax_main.grid(True, alpha=0.3)
 
-        # Create sliders
-        self.sliders = {}
-        slider_positions = [
-            (gs[1, 0], 'h', 'Convection Coef. h'),
-            (gs[1, 1], 'm', 'Mass m'),
-            (gs[2, 0], 'A', 'Surface Area A'),
-            (gs[2, 1], 'T0', 'Initial Temp T0'),
-        ]
-
-        for position, param, label in slider_positions:
-            ax_slider = self.fig.add_subplot(position)
-            min_val, max_val, init_val = self.param_ranges[param]
-
-            slider = Slider(
-                ax=ax_slider,
-                label=label,
-                valmin=min_val,
-                valmax=max_val,
-                valinit=init_val,
-                orientation='horizontal'
-            )
-            slider.on_changed(lambda val, p=param: self.update_parameter(p, val))
-            self.sliders[param] = slider
+        # Create sliders in grid order
+        slider_artists = self._init_sliders([gs[1, 0], gs[1, 1], gs[2, 0], gs[2, 1]])
 
         # Add text box for parameter info
-        self.info_text = self.fig.text(
+        self._last_info = self.get_info_string()
+        self.info_artist = self.fig.text(
             0.5, 0.02,
-            self.get_info_string(),
+            self._last_info,
             ha='center',
             fontsize=10,
-            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
+            animated=True
         )
 
+        self._init_blitting([self.line_T, self.line_Tinf, self.info_artist] + slider_artists)
+
         plt.suptitle('Adjust parameters using sliders below',
                     y=0.98, fontsize=12, style='italic')
 
-    def update_parameter(self, param_name, value):
-        """Update a parameter and re-simulate."""
-        print(f"Updating {param_name} = {value:.3f}")
-        self.current_params[param_name] = value
+    def _update_plot(self):
+        """Update the lines; returns True if the y-axis limits changed."""
+        self.line_T.set_ydata(self.temperature)
+        self.line_Tinf.set_ydata(self.ambient_temp)
 
-        # Re-simulate
-        try:
-            self.simulate()
-
-            # Update plot
-            self.line_T.set_ydata(self.temperature)
-            self.line_Tinf.set_ydata(self.ambient_temp)
-
-            # Update y-axis limits
-            all_temps = np.concatenate([self.temperature, self.ambient_temp])
-            margin = 5
-            self.ax_main.set_ylim(all_temps.min() - margin, all_temps.max() + margin)
-
-            # Update info text
-            self.info_text.set_text(self.get_info_string())
-
-            self.fig.canvas.draw_idle()
-
-        except Exception as e:
-            print(f"Error during simulation: {e}")
+        lo = min(self.temperature.min(), self.ambient_temp.min())
+        hi = max(self.temperature.max(), self.ambient_temp.max())
+        return fit_ylim(self.ax_main, lo, hi)
 
     def get_info_string(self):
         """Generate info string with current parameters and results."""
@@ -148,18 +119,9 @@ class CoolingModelExplorer:
         initial_temp = self.temperature[0]
         temp_drop = initial_temp - final_temp
 
-        info = (
-            f"Parameters: h={self.current_params['h']:.3f}, "
-            f"m={self.current_params['m']:.3f}, "
-            f"A={self.current_params['A']:.3f}, "
-            f"T0={self.current_params['T0']:.2f}K | "
-            f"Final T={final_temp:.2f}K (drop: {temp_drop:.2f}K)"
+        return INFO_TEMPLATE.format_map(
+            dict(self.current_params, final_temp=final_temp, temp_drop=temp_drop)
         )
-        return info
-
-    def show(self):
-        """Display the interactive plot."""
-        plt.show()
 
 
 def main():
@@ -3,17 +3,24 @@
 Simple example of loading and simulating a Modelica model with OMPython.
 """
 
+import argparse
+import importlib.util
 import sys
 import pathlib
-import matplotlib.pyplot as plt
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
 
 from OMPython import ModelicaSystem
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-plot', action='store_true',
+                        help='only simulate and print results (headless run)')
+    args = parser.parse_args()
+
     # Define paths
     project_dir = pathlib.Path(__file__).parent.parent.parent
     model_file = project_dir / "mo_example" / "cooling.mo"
@@ -58,15 +65,19 @@ def main():
 
     # Get results
     print("\n=== Extracting Results ===")
-    time = mod.getSolutions("time")[0]
-    temperature = mod.getSolutions("T")[0]
-    ambient_temp = mod.getSolutions("T_inf")[0]
+    time, temperature, ambient_temp = mod.getSolutions(["time", "T", "T_inf"])
 
     print(f"  Time points: {len(time)}")
     print(f"  Initial temperature: {temperature[0]:.2f} K")
     print(f"  Final temperature: {temperature[-1]:.2f} K")
 
-    # Plot results
+    if args.no_plot:
+        print("\n=== Done! ===")
+        return
+
+    # Plot results; matplotlib is only imported when a plot is requested
+    import matplotlib.pyplot as plt
+
     print("\n=== Creating Plot ===")
     plt.figure(figsize=(10, 6))
 
@@ -4,83 +4,161 @@ Newton Cooling Dynamic Model Simulation
 Loads the NewtonCoolingDynamic model, varies parameters, and plots results.
 """
 
+import argparse
+import os
+import importlib.util
 import sys
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Add parent directory to path to import OMPython
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
 
 from OMPython import ModelicaSystem
 
 
-def simulate_with_parameters(model_file, model_name, param_variations, sim_time=1.0):
+# ModelicaSystem instances of the current (worker) process, keyed by
+# (model_file, model_name); kept alive so that every sweep handled by the
+# same worker reuses its OMC session and compiled model
+_models = {}
+
+
+def _get_model(model_file, model_name):
     """
-    Simulate the model with different parameter values.
+    Return the ModelicaSystem of this process for the given model.
 
-    Args:
-        model_file: Path to the .mo file
-        model_name: Name of the model class
-        param_variations: Dict of parameter variations {param_name: [values]}
-        sim_time: Simulation stop time
+    The model is built on first use only.
 
     Returns:
-        Dict with simulation results for each variation
+        Tuple (ModelicaSystem instance, dict of default parameter values,
+        set of parameter names overridden by earlier sweeps)
+    """
+    key = (model_file, model_name)
+    if key not in _models:
+        mod = ModelicaSystem(
+            fileName=model_file,
+            modelName=model_name,
+            build=True
+        )
+        # copy: getParameters() returns the live dict updated by setParameters()
+        _models[key] = (mod, dict(mod.getParameters()), set())
+
+    return _models[key]
+
+
+def _sweep_parameter(model_file, model_name, param_name, param_values, sim_time):
+    """
+    Simulate the model for each value of a single parameter.
+
+    Runs in a worker process; every ModelicaSystem instance uses its own
+    temporary build directory, so parallel sweeps do not interfere.
+
+    Returns:
+        List of result dicts, one per value in param_values
     """
-    results = {}
+    print(f"\n=== Varying parameter: {param_name} ===")
+    param_results = []
+
+    # Only param_name changes below, so the compiled model is reused for
+    # every value
+    mod, defaults, overridden = _get_model(model_file, model_name)
+
+    # Reset the parameters of earlier sweeps in this process to their defaults
+    if overridden:
+        mod.setParameters({name: defaults[name] for name in overridden})
+        overridden.clear()
+    overridden.add(param_name)
 
-    for param_name, param_values in param_variations.items():
-        print(f"\n=== Varying parameter: {param_name} ===")
-        results[param_name] = []
+    # Set simulation options
+    mod.setSimulationOptions({
+        'stopTime': str(sim_time),
+        'stepSize': '0.002',
+        'tolerance': '1e-6'
+    })
 
-        for value in param_values:
-            print(f"  Simulating with {param_name}={value}...")
+    for value in param_values:
+        print(f"  Simulating with {param_name}={value}...")
 
-            # Create ModelicaSystem instance
-            mod = ModelicaSystem(
-                fileName=model_file,
-                modelName=model_name,
-                build=True
-            )
+        # Set parameter value
+        mod.setParameters({param_name: str(value)})
 
-            # Set simulation options
-            mod.setSimulationOptions({
-                'stopTime': str(sim_time),
-                'stepSize': '0.002',
-                'tolerance': '1e-6'
-            })
+        # Run simulation
+        mod.simulate()
 
-            # Set parameter value
-            mod.setParameters({param_name: str(value)})
+        # Get results
+        time, temperature, ambient_temp = mod.getSolutions(["time", "T", "T_inf"])
 
-            # Run simulation
-            mod.simulate()
+        param_results.append({
+            'value': value,
+            'time': time,
+            'T': temperature,
+            'T_inf': ambient_temp
+        })
 
-            # Get results
-            time = mod.getSolutions("time")[0]
-            temperature = mod.getSolutions("T")[0]
-            ambient_temp = mod.getSolutions("T_inf")[0]
+        print(f"    ✓ Simulation complete. Final temp: {temperature[-1]:.2f} K")
 
-            results[param_name].append({
-                'value': value,
-                'time': time,
-                'T': temperature,
-                'T_inf': ambient_temp
-            })
+    return param_results
 
-            print(f"    ✓ Simulation complete. Final temp: {temperature[-1]:.2f} K")
+
+def simulate_with_parameters(model_file, model_name, param_variations, sim_time=1.0,
+                             max_workers=None):
+    """
+    Simulate the model with different parameter values.
+
+    Each varied parameter is swept in its own worker process. With
+    max_workers=1 all sweeps run in this process and share a single model
+    build.
+
+    Args:
+        model_file: Path to the .mo file
+        model_name: Name of the model class
+        param_variations: Dict of parameter variations {param_name: [values]}
+        sim_time: Simulation stop time
+        max_workers: Number of worker processes (default: one per parameter,
+            limited by the CPU count)
+
+    Returns:
+        Dict with simulation results for each variation
+    """
+    if max_workers is None:
+        max_workers = min(len(param_variations), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        return {
+            param_name: _sweep_parameter(model_file, model_name,
+                                         param_name, param_values, sim_time)
+            for param_name, param_values in param_variations.items()
+        }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            param_name: executor.submit(_sweep_parameter, model_file, model_name,
+                                        param_name, param_values, sim_time)
+            for param_name, param_values in param_variations.items()
+        }
+
+        # collect in the order of param_variations
+        results = {param_name: future.result() for param_name, future in futures.items()}
 
     return results
 
 
-def plot_results(results, output_dir):
+def _stack(param_results, key):
+    """Stack one result array of every run into a (runs, samples) array."""
+    return np.vstack([r[key] for r in param_results])
+
+
+def plot_results(results, output_dir, show=False):
     """
     Create plots for all parameter variations.
 
     Args:
         results: Results from simulate_with_parameters()
         output_dir: Directory to save plots
+        show: Keep the figures open for a later plt.show()
     """
     output_dir = pathlib.Path(output_dir)
     output_dir.mkdir(exist_ok=True)
@@ -89,28 +167,29 @@ def plot_results(results, output_dir):
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
         fig.suptitle(f'Newton Cooling - Varying {param_name}', fontsize=14, fontweight='bold')
 
+        # All runs share the same output grid, so stack them as (runs, samples)
+        time = param_results[0]['time']
+        T_stack = _stack(param_results, 'T')
+        diff_stack = T_stack - _stack(param_results, 'T_inf')
+        labels = [f"{param_name}={result['value']}" for result in param_results]
+
         # Plot temperature over time
-        for result in param_results:
-            label = f"{param_name}={result['value']}"
-            ax1.plot(result['time'], result['T'], label=label, linewidth=2)
+        lines = ax1.plot(time, T_stack.T, linewidth=2)
 
         ax1.set_xlabel('Time (s)')
         ax1.set_ylabel('Temperature (K)')
         ax1.set_title('Object Temperature vs Time')
         ax1.grid(True, alpha=0.3)
-        ax1.legend()
+        ax1.legend(lines, labels)
 
         # Plot temperature difference over time
-        for result in param_results:
-            temp_diff = result['T'] - result['T_inf']
-            label = f"{param_name}={result['value']}"
-            ax2.plot(result['time'], temp_diff, label=label, linewidth=2)
+        lines = ax2.plot(time, diff_stack.T, linewidth=2)
 
         ax2.set_xlabel('Time (s)')
         ax2.set_ylabel('Temperature Difference (K)')
         ax2.set_title('Temperature Difference (T - T_inf) vs Time')
         ax2.grid(True, alpha=0.3)
-        ax2.legend()
+        ax2.legend(lines, labels)
 
         plt.tight_layout()
 
@@ -119,18 +198,18 @@ def plot_results(results, output_dir):
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
         print(f"\n✓ Plot saved: {output_file}")
 
-        # Also show the plot
-        plt.show()
-        plt.close()
+        if not show:
+            plt.close(fig)
 
 
-def plot_comparison(results, output_dir):
+def plot_comparison(results, output_dir, show=False):
     """
     Create a comparison plot showing final temperatures for different parameters.
 
     Args:
         results: Results from simulate_with_parameters()
         output_dir: Directory to save plots
+        show: Keep the figure open for a later plt.show()
     """
     output_dir = pathlib.Path(output_dir)
 
@@ -141,7 +220,7 @@ def plot_comparison(results, output_dir):
 
     for (param_name, param_results), color in zip(results.items(), colors):
         param_values = [r['value'] for r in param_results]
-        final_temps = [r['T'][-1] for r in param_results]
+        final_temps = _stack(param_results, 'T')[:, -1]
 
         positions = np.arange(len(param_values)) + x_offset
         ax.bar(positions, final_temps, width=0.8, label=param_name,
@@ -165,12 +244,24 @@ def plot_comparison(results, output_dir):
     output_file = output_dir / "cooling_comparison.png"
     plt.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"✓ Comparison plot saved: {output_file}")
-    plt.show()
-    plt.close()
+
+    if not show:
+        plt.close(fig)
 
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Newton Cooling parameter study")
+    parser.add_argument('--show', action='store_true',
+                        help='display the plots after saving them')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes; 1 runs all sweeps '
+                             'in-process with a single model build')
+    args = parser.parse_args()
+
+    if not args.show:
+        # batch run: render the PNG files without a GUI backend
+        plt.switch_backend('Agg')
 
     # Define paths
     script_dir = pathlib.Path(__file__).parent
@@ -205,7 +296,8 @@ def main():
             model_file=str(model_file),
             model_name=model_name,
             param_variations=param_variations,
-            sim_time=1.5
+            sim_time=1.5,
+            max_workers=args.workers
         )
 
         print("\n" + "=" * 70)
@@ -213,8 +305,11 @@ def main():
         print("=" * 70)
 
         # Create plots
-        plot_results(results, script_dir / "results")
-        plot_comparison(results, script_dir / "results")
+        plot_results(results, script_dir / "results", show=args.show)
+        plot_comparison(results, script_dir / "results", show=args.show)
+
+        if args.show:
+            plt.show()
 
         print("\n" + "=" * 70)
         print("✓ All simulations and plots completed successfully!")
@@ -3,11 +3,13 @@
 Basic test to verify the simulation works without GUI.
 """
 
+import importlib.util
 import sys
 import pathlib
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
 
 from OMPython import ModelicaSystem
 
@@ -62,9 +64,7 @@ def main():
         print("=" * 70)
 
         # Get results
-        time = mod.getSolutions("time")[0]
-        temperature = mod.getSolutions("T")[0]
-        ambient_temp = mod.getSolutions("T_inf")[0]
+        time, temperature, ambient_temp = mod.getSolutions(["time", "T", "T_inf"])
 
         print(f"\nSimulation statistics:")
         print(f"  Time points: {len(time)}")
@@ -0,0 +1,280 @@
+"""
+Shared base of the interactive workshop explorers.
+
+Used by cooling/interactive_explorer.py and smr/interactive_dashboard.py:
+reading OpenModelica result files, caching the model runs and updating the
+figure with debounced, blitted slider events.
+"""
+
+from collections import OrderedDict, namedtuple
+import matplotlib.pyplot as plt
+
+from OMPython import ModelicaSystem
+
+from _matresult import read_mat_result
+
+# Number of parameter sets whose simulation results are kept in memory
+RESULT_CACHE_SIZE = 128
+
+# Range and slider of a model parameter: values in model units, the slider
+# shows value / scale; parameters without label get no slider
+SliderSpec = namedtuple('SliderSpec', 'min max default label scale')
+
+
+def fit_ylim(ax, lo, hi, bottom=None, margin=0.15):
+    """
+    Fit the y-limits of an axes to the data range [lo, hi] with hysteresis.
+
+    The limits are kept as long as the data stays inside them and still
+    spans at least half of the axis; otherwise they are reset with a
+    relative margin on each side. Unchanged limits keep blitting valid.
+
+    Args:
+        ax: Axes to adjust
+        lo, hi: Data range to show
+        bottom: Fixed lower limit (optional)
+        margin: Margin as fraction of the data range
+
+    Returns:
+        True if the limits were changed
+    """
+    if bottom is not None:
+        lo = bottom
+    cur_lo, cur_hi = ax.get_ylim()
+    if cur_lo <= lo and hi <= cur_hi and (hi - lo) >= 0.5 * (cur_hi - cur_lo):
+        return False
+
+    pad = margin * (hi - lo) or 1.0
+    ax.set_ylim(lo - pad if bottom is None else bottom, hi + pad)
+    return True
+
+
+class ParameterExplorer:
+    """
+    Base class of the interactive parameter explorers.
+
+    Builds the model once, simulates it for the slider values and caches the
+    results. Subclasses define the figure:
+
+    - _load(results): store the arrays of result_names in the plot buffers
+    - setup_interactive_plot(): create the figure, then call
+      _init_sliders() and _init_blitting()
+    - _update_plot(): update the animated artists from the plot buffers;
+      returns True if the axis limits changed
+    - get_info_string(): text of the info box (self.info_artist)
+    """
+
+    def __init__(self, model_file, model_name, specs, sim_options, result_names):
+        """
+        Args:
+            model_file: Path to the .mo file
+            model_name: Name of the model class
+            specs: Dict of SliderSpec per model parameter
+            sim_options: Simulation options of every run
+            result_names: Variables to read from every result
+        """
+        self.model_file = model_file
+        self.model_name = model_name
+        self.specs = specs
+        self.result_names = result_names
+
+        # Build the model once; parameter updates only re-run the executable
+        self.mod = ModelicaSystem(
+            fileName=self.model_file,
+            modelName=self.model_name,
+            build=True
+        )
+
+        self.mod.setSimulationOptions(sim_options)
+
+        # Simulation results keyed by parameter set (LRU order)
+        self._cache = OrderedDict()
+        # Parameter values already passed to the model
+        self._applied_params = {}
+
+        # Time grid, read once: it only depends on the fixed simulation options
+        self.time = None
+
+        # Initial simulation
+        self.current_params = {name: spec.default for name, spec in self.specs.items()}
+        self.simulate()
+
+        # Create interactive plot
+        self.setup_interactive_plot()
+
+    def simulate(self):
+        """Run simulation with current parameters."""
+        key = self._cache_key()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._load(self._cache[key])
+            return
+
+        # The model keeps earlier overrides, so only pass what changed since
+        # the last run to the override file of the executable
+        changed = {k: v for k, v in self.current_params.items()
+                   if self._applied_params.get(k) != v}
+        if changed:
+            self.mod.setParameters({k: str(v) for k, v in changed.items()})
+            self._applied_params.update(changed)
+        self.mod.simulate()
+
+        result_file = self.mod.getWorkDirectory() / f"{self.model_name}_res.mat"
+        if self.time is None:
+            self.time, *results = read_mat_result(result_file, ["time"] + self.result_names)
+        else:
+            results = read_mat_result(result_file, self.result_names)
+
+        self._cache[key] = tuple(results)
+        if len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        self._load(results)
+
+    def _cache_key(self):
+        """
+        Return the result cache key of current_params.
+
+        The values are rounded to 4 significant digits so that revisited
+        slider positions hit the cache; the model itself is simulated with
+        the exact values.
+        """
+        return tuple(sorted((name, float(f"{value:.4g}"))
+                            for name, value in self.current_params.items()))
+
+    def _init_sliders(self, positions):
+        """
+        Create one slider per spec with a label, in the given grid positions.
+
+        Returns:
+            List of the slider artists to animate
+        """
+        from matplotlib.widgets import Slider
+
+        # Debounce slider events: only the last value within 150 ms is simulated
+        self._pending = {}
+        self._update_timer = self.fig.canvas.new_timer(interval=150)
+        self._update_timer.single_shot = True
+        self._update_timer.add_callback(self._flush_pending)
+
+        self.sliders = {}
+        slider_artists = []
+        slider_specs = [(name, spec) for name, spec in self.specs.items()
+                        if spec.label is not None]
+
+        for position, (param, spec) in zip(positions, slider_specs):
+            ax_slider = self.fig.add_subplot(position)
+
+            slider = Slider(
+                ax=ax_slider,
+                label=spec.label,
+                valmin=spec.min / spec.scale,
+                valmax=spec.max / spec.scale,
+                valinit=spec.default / spec.scale,
+                orientation='horizontal'
+            )
+            slider.on_changed(
+                lambda val, p=param, s=spec.scale: self._schedule_update(p, val * s)
+            )
+            self.sliders[param] = slider
+
+            # The moving parts are blitted instead of redrawing the canvas
+            slider.drawon = False
+            for artist in (slider.poly, getattr(slider, '_handle', None), slider.valtext):
+                if artist is not None:
+                    artist.set_animated(True)
+                    slider_artists.append(artist)
+
+        return slider_artists
+
+    def _init_blitting(self, animated):
+        """
+        Blit the given animated artists on updates.
+
+        The static figure is cached on every full draw (including resizes)
+        and only the animated artists are redrawn on updates.
+        """
+        self._animated = animated
+        self._background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _schedule_update(self, param_name, value):
+        """Record a slider value and restart the debounce timer."""
+        self._pending[param_name] = value
+        self._update_timer.stop()
+        self._update_timer.start()
+        # show the new slider position right away
+        self._blit()
+
+    def _flush_pending(self):
+        """Apply the slider values collected while the timer was running."""
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.update_parameters(pending)
+
+    def update_parameters(self, values):
+        """
+        Update parameters and re-simulate.
+
+        All values are applied before the single simulation, so sliders
+        moved within one debounce interval cost one run.
+
+        Args:
+            values: Dict of new parameter values
+        """
+        for param_name, value in values.items():
+            print(f"Updating {param_name} = {value:.4g}")
+        self.current_params.update(values)
+
+        # Re-simulate
+        try:
+            self.simulate()
+
+            # Update plot; the axis limits only change when the data no
+            # longer fits
+            ylim_changed = self._update_plot()
+
+            # Update info text
+            self._update_info_text()
+
+            # A change of the axis limits invalidates the cached background
+            if ylim_changed:
+                self.fig.canvas.draw_idle()
+            else:
+                self._blit()
+
+        except Exception as e:
+            print(f"Error during simulation: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _on_draw(self, event):
+        """Cache the static background after a full redraw."""
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """Draw the animated artists on top of the current canvas."""
+        for artist in self._animated:
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        """Redraw only the animated artists over the cached background."""
+        if self._background is None:
+            self.fig.canvas.draw_idle()
+            return
+
+        self.fig.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.fig.canvas.blit(self.fig.bbox)
+
+    def _update_info_text(self):
+        """Update the info text; skip the relayout if the text is unchanged."""
+        info = self.get_info_string()
+        if info != self._last_info:
+            self.info_artist.set_text(info)
+            self._last_info = info
+
+    def show(self):
+        """Display the interactive plot."""
+        plt.show()
@@ -0,0 +1,33 @@
+"""
+Numerical kernels of the SMR workshop scripts.
+
+The kernels are compiled with numba when it is installed. cache=True stores
+the compiled code in __pycache__, so only the first run of a script pays
+for the compilation. Without numba the kernels run as plain Python/NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def variations(values, offsets):
+    """Return (max - min) / mean in % of every study values[offsets[i]:offsets[i + 1]]."""
+    n = len(offsets) - 1
+    out = np.empty(n)
+    for i in prange(n):
+        row = values[offsets[i]:offsets[i + 1]]
+        out[i] = (row.max() - row.min()) / row.mean() * 100.0
+    return out
+
+
+def warmup():
+    """Compile, or load from the cache, every kernel for the types used by the scripts."""
+    variations(np.ones(1), np.array([0, 1], dtype=np.int64))
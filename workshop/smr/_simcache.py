@@ -0,0 +1,104 @@
+"""
+On-disk cache of SMR simulation results.
+
+Results are stored in ~/.cache/ompython_smr/ and keyed by a hash of the
+model source, the parameter overrides and the simulation options, so that
+repeated runs of the workshop scripts skip the OpenModelica build and
+simulation. Set SMR_CACHE=0 to always simulate.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+
+import numpy as np
+
+CACHE_DIR = pathlib.Path.home() / ".cache" / "ompython_smr"
+
+
+def _cache_key(model_file, model_name, options, params):
+    """Return the sha256 hex digest identifying a simulation."""
+    digest = hashlib.sha256(pathlib.Path(model_file).read_bytes())
+    digest.update(repr((
+        model_name,
+        sorted((name, str(value)) for name, value in (params or {}).items()),
+        sorted((name, str(value)) for name, value in options.items()),
+    )).encode())
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write):
+    """Call write(file) on a temporary file, then move it to path."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _entry_files(model_file, model_name, options, params):
+    """Return the (.npz results, .json parameters) files of a cache entry."""
+    key = _cache_key(model_file, model_name, options, params)
+    return CACHE_DIR / f"{key}.npz", CACHE_DIR / f"{key}.json"
+
+
+def load_cached(model_file, model_name, options, params=None):
+    """
+    Return the cached results of a simulation, or None on a cache miss.
+
+    Arguments as for cached_simulate().
+    """
+    if os.environ.get('SMR_CACHE') == '0':
+        return None
+
+    result_file, params_file = _entry_files(model_file, model_name, options, params)
+
+    # the .npz file is written last, so it marks a complete entry
+    if not result_file.exists():
+        return None
+
+    with np.load(result_file) as data:
+        results = {name: data[name] for name in data.files}
+    all_params = json.loads(params_file.read_text())
+    return results, all_params
+
+
+def cached_simulate(simulate, model_file, model_name, options, params=None, refresh=False):
+    """
+    Return the results of simulate(), reusing a previous run if possible.
+
+    Args:
+        simulate: Function simulate(model_file, model_name, options, params)
+            returning (results dict of arrays, all_params dict)
+        model_file: Path to the .mo file
+        model_name: Name of the model class
+        options: Dict of simulation options, e.g. {'stopTime': '1000'}
+        params: Dict of parameter overrides
+        refresh: Always simulate and replace the cached entry
+
+    Returns:
+        Tuple (results dict of arrays, all_params dict)
+    """
+    if os.environ.get('SMR_CACHE') == '0':
+        return simulate(model_file, model_name, options, params)
+
+    if not refresh:
+        cached = load_cached(model_file, model_name, options, params)
+        if cached is not None:
+            return cached
+
+    results, all_params = simulate(model_file, model_name, options, params)
+
+    result_file, params_file = _entry_files(model_file, model_name, options, params)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(params_file,
+                  lambda f: f.write(json.dumps(dict(all_params)).encode()))
+    _write_atomic(result_file,
+                  lambda f: np.savez_compressed(f, **results))
+
+    return results, all_params
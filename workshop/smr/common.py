@@ -0,0 +1,179 @@
+"""
+Shared simulation setup for the SMR Power Plant workshop scripts.
+
+test_basic.py, visualize_smr.py and parameter_study.py all start from the
+baseline simulation of the model with its default parameters.
+get_baseline() runs it once per process, and _simcache reuses it across
+runs; test_basic.py always simulates it anew.
+"""
+
+import functools
+import importlib.util
+import sys
+import pathlib
+from collections import OrderedDict
+
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+
+from OMPython import ModelicaSystem
+
+import _kernels
+from _simcache import cached_simulate
+
+PROJECT_DIR = pathlib.Path(__file__).parent.parent.parent
+MODEL_FILE = PROJECT_DIR / "mo_example" / "srm.mo"
+MODEL_NAME = "SMR_PowerPlant"
+
+# Number of simulate_smr() results kept in memory; the least recently used
+# one is dropped first
+SIM_MEMO_SIZE = 8
+_SIM_MEMO = OrderedDict()
+
+# Compile the numba kernels now (or load them from the numba cache), so that
+# the first call from a plot function is already fast
+_kernels.warmup()
+
+
+def simulation_options(sim_time):
+    """Return the simulation options used by all SMR scripts."""
+    return {
+        'stopTime': str(sim_time),
+        'stepSize': '1.0',
+        'tolerance': '1e-6'
+    }
+
+
+# ModelicaSystem instances of the current process, keyed by
+# (model_file, model_name); kept alive so that every simulation in the same
+# (worker) process reuses its OMC session and compiled model
+_models = {}
+
+
+def get_model(model_file, model_name):
+    """
+    Return the ModelicaSystem of this process for the given model.
+
+    The model is built on first use only.
+
+    Returns:
+        Tuple (ModelicaSystem instance, dict of default parameter values,
+        set of parameter names overridden by earlier simulations)
+    """
+    key = (str(model_file), model_name)
+    if key not in _models:
+        mod = ModelicaSystem(
+            fileName=str(model_file),
+            modelName=model_name,
+            build=True
+        )
+        # copy: getParameters() returns the live dict updated by setParameters()
+        _models[key] = (mod, dict(mod.getParameters()), set())
+
+    return _models[key]
+
+
+def get_results(mod):
+    """Return the SMR results of the last simulation of mod as a dict of arrays."""
+    time, T_core, Q_transfer, P_electric = mod.getSolutions(
+        ["time", "T_core", "Q_transfer", "P_electric"])
+    return {
+        'time': time,
+        'T_core': T_core,
+        'Q_transfer': Q_transfer,
+        'P_electric': P_electric,
+    }
+
+
+def _run_simulation(model_file, model_name, options, params):
+    """Simulate the model of this process with the given parameter overrides."""
+    mod, defaults, overridden = get_model(model_file, model_name)
+    params = params or {}
+
+    # setParameters() overrides persist, so reset the parameters of earlier
+    # simulations in this process to their defaults
+    stale = overridden - params.keys()
+    if stale:
+        mod.setParameters({name: defaults[name] for name in stale})
+        overridden.difference_update(stale)
+    overridden.update(params)
+
+    mod.setSimulationOptions(options)
+    if params:
+        mod.setParameters(params)
+    mod.simulate()
+
+    return get_results(mod), dict(mod.getParameters())
+
+
+def simulate_smr(model_file, model_name, sim_time=1000, params=None, use_cache=True):
+    """
+    Run SMR simulation with optional parameter overrides.
+
+    Results are cached on disk (see _simcache), so repeated calls with the
+    same model, parameters and sim_time skip the build and simulation. The
+    last SIM_MEMO_SIZE results are also kept in memory; those are shared
+    between callers and must not be modified.
+
+    With use_cache=False the model is always simulated; the new
+    result replaces the cached one.
+    """
+    key = (str(model_file), model_name, sim_time,
+           frozenset((params or {}).items()))
+    if use_cache and key in _SIM_MEMO:
+        _SIM_MEMO.move_to_end(key)
+        return _SIM_MEMO[key]
+
+    result = cached_simulate(_run_simulation, model_file, model_name,
+                             simulation_options(sim_time), params,
+                             refresh=not use_cache)
+
+    _SIM_MEMO[key] = result
+    _SIM_MEMO.move_to_end(key)
+    if len(_SIM_MEMO) > SIM_MEMO_SIZE:
+        _SIM_MEMO.popitem(last=False)
+
+    return result
+
+
+def decimate(t, y, max_pts=5000):
+    """
+    Thin a time series out to at most max_pts samples for plotting.
+
+    Keeps every n-th sample, so the returned arrays are views of t and y.
+    """
+    if len(t) <= max_pts:
+        return t, y
+    stride = -(-len(t) // max_pts)  # ceil
+    return t[::stride], y[::stride]
+
+
+def save_figure(fig, output_file):
+    """
+    Save a figure of the SMR scripts as PNG.
+
+    Only uses the figure itself, not pyplot, so it can run in a background
+    thread while the next figure is drawn.
+    """
+    output_file.parent.mkdir(exist_ok=True)
+    fig.savefig(output_file, format='png', dpi=100)
+    print(f"  ✓ Saved: {output_file}")
+
+
+@functools.lru_cache(maxsize=8)
+def get_baseline(sim_time=1000, params_key=None):
+    """
+    Return the simulation of the SMR model, computed once per process.
+
+    Args:
+        sim_time: Simulation stop time
+        params_key: Parameter overrides as a tuple of (name, value) pairs
+            (default: the model defaults)
+
+    Returns:
+        Tuple (results dict, all_params dict); both are shared between
+        callers and must not be modified
+    """
+    params = dict(params_key) if params_key else None
+    return simulate_smr(MODEL_FILE, MODEL_NAME, sim_time, params)
@@ -4,62 +4,74 @@ Interactive dashboard for SMR Power Plant model.
 Allows real-time parameter adjustment and visualization.
 """
 
+import importlib.util
 import sys
 import pathlib
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
 import numpy as np
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+# Add parent directory to path, unless OMPython is installed
+if importlib.util.find_spec("OMPython") is None:
+    sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
 
-from OMPython import ModelicaSystem
+# The explorer base (workshop/explorer_base.py) is shared by the workshops
+# and never installed, so unlike OMPython above it cannot be found any other
+# way: this path is always needed, and the script has to stay in the checkout
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 
+from explorer_base import ParameterExplorer, SliderSpec, fit_ylim
 
-class SMRDashboard:
+# Text of the info box; formatted with the current parameters and results
+INFO_TEMPLATE = (
+    "Parameters: Q_fission={Q_fission_MW:.1f} MW, η={eff_thermal:.2f}, "
+    "UA={UA_kW:.1f} kW/K, m={m_coolant:.0f} kg\n"
+    "Steady State: T_core={final_temp:.1f}°C, P_electric={final_power:.1f} MW, "
+    "Q_transfer={final_heat:.1f} MW, Efficiency={actual_eff:.1f}%"
+)
+
+
+class SMRDashboard(ParameterExplorer):
     """Interactive dashboard for SMR Power Plant parameters."""
 
     def __init__(self, model_file, model_name):
-        self.model_file = model_file
-        self.model_name = model_name
-
-        # Parameter ranges (min, max, default)
-        self.param_ranges = {
-            'Q_fission': (5e7, 2e8, 1e8),        # Fission power (W)
-            'eff_thermal': (0.20, 0.45, 0.35),   # Efficiency
-            'UA': (2e4, 1e5, 5e4),               # Heat exchanger UA (W/K)
-            'm_coolant': (200, 1000, 500),       # Coolant mass (kg)
-        }
-
-        # Initial simulation
-        self.current_params = {k: v[2] for k, v in self.param_ranges.items()}
-        self.simulate()
-
-        # Create interactive plot
-        self.setup_interactive_plot()
-
-    def simulate(self):
-        """Run simulation with current parameters."""
-        print(f"Simulating with: {self.current_params}")
-
-        mod = ModelicaSystem(
-            fileName=self.model_file,
-            modelName=self.model_name,
-            build=True
+        # Plot buffers, allocated on the first simulation and updated in place
+        self.T_core = self.Q_transfer = self.P_electric = None
+        # Same results in plot units (°C, MW)
+        self.T_core_C = self.Q_transfer_MW = self.P_electric_MW = None
+
+        super().__init__(
+            model_file, model_name,
+            # Parameter ranges and sliders
+            specs={
+                'Q_fission': SliderSpec(5e7, 2e8, 1e8, 'Fission Power (MW)', 1e6),
+                'eff_thermal': SliderSpec(0.20, 0.45, 0.35, 'Efficiency', 1),
+                'UA': SliderSpec(2e4, 1e5, 5e4, 'Heat Exchanger UA (kW/K)', 1e3),
+                'm_coolant': SliderSpec(200, 1000, 500, 'Coolant Mass (kg)', 1),
+            },
+            sim_options={
+                'stopTime': '1000',
+                'stepSize': '2.0'
+            },
+            result_names=["T_core", "Q_transfer", "P_electric"]
         )
 
-        mod.setSimulationOptions({
-            'stopTime': '1000',
-            'stepSize': '2.0'
-        })
+    def _load(self, results):
+        """Copy a simulation result into the preallocated plot buffers."""
+        if self.T_core is None:
+            self.T_core, self.Q_transfer, self.P_electric = (
+                np.empty_like(values) for values in results
+            )
+            self.T_core_C, self.Q_transfer_MW, self.P_electric_MW = (
+                np.empty_like(values) for values in results
+            )
 
-        mod.setParameters({k: str(v) for k, v in self.current_params.items()})
-        mod.simulate()
+        for buffer, values in zip((self.T_core, self.Q_transfer, self.P_electric), results):
+            buffer[:] = values
 
-        self.time = mod.getSolutions("time")[0]
-        self.T_core = mod.getSolutions("T_core")[0]
-        self.Q_transfer = mod.getSolutions("Q_transfer")[0]
-        self.P_electric = mod.getSolutions("P_electric")[0]
+        # Convert units once per result instead of at every use
+        np.subtract(self.T_core, 273.15, out=self.T_core_C)
+        np.multiply(self.Q_transfer, 1e-6, out=self.Q_transfer_MW)
+        np.multiply(self.P_electric, 1e-6, out=self.P_electric_MW)
 
     def setup_interactive_plot(self):
         """Create the interactive matplotlib figure with sliders."""
@@ -74,8 +86,8 @@ class SMRDashboard:
 
         # Initialize plots
         self.line_temp, = self.ax_temp.plot(
-            self.time, self.T_core - 273.15,
-            'r-', linewidth=2, label='Core Temperature'
+            self.time, self.T_core_C,
+            'r-', linewidth=2, label='Core Temperature', animated=True
         )
         self.ax_temp.set_xlabel('Time (s)', fontsize=11)
         self.ax_temp.set_ylabel('Temperature (°C)', fontsize=11)
@@ -85,12 +97,12 @@ class SMRDashboard:
         self.ax_temp.grid(True, alpha=0.3)
 
         self.line_power_e, = self.ax_power.plot(
-            self.time, self.P_electric / 1e6,
-            'b-', linewidth=2, label='Electric Power'
+            self.time, self.P_electric_MW,
+            'b-', linewidth=2, label='Electric Power', animated=True
         )
         self.line_power_t, = self.ax_power.plot(
-            self.time, self.Q_transfer / 1e6,
-            'g--', linewidth=2, label='Heat Transfer'
+            self.time, self.Q_transfer_MW,
+            'g--', linewidth=2, label='Heat Transfer', animated=True
         )
         self.ax_power.set_xlabel('Time (s)', fontsize=11)
         self.ax_power.set_ylabel('Power (MW)', fontsize=11)
@@ -99,106 +111,58 @@ class SMRDashboard:
         self.ax_power.legend()
         self.ax_power.grid(True, alpha=0.3)
 
-        # Create sliders
-        self.sliders = {}
-        slider_configs = [
-            (gs[1, 0], 'Q_fission', 'Fission Power (MW)', 1e6),
-            (gs[1, 1], 'eff_thermal', 'Efficiency', 1),
-            (gs[2, 0], 'UA', 'Heat Exchanger UA (kW/K)', 1e3),
-            (gs[2, 1], 'm_coolant', 'Coolant Mass (kg)', 1),
-        ]
-
-        for position, param, label, scale in slider_configs:
-            ax_slider = self.fig.add_subplot(position)
-            min_val, max_val, init_val = self.param_ranges[param]
-
-            slider = Slider(
-                ax=ax_slider,
-                label=label,
-                valmin=min_val / scale,
-                valmax=max_val / scale,
-                valinit=init_val / scale,
-                orientation='horizontal'
-            )
-            slider.on_changed(
-                lambda val, p=param, s=scale: self.update_parameter(p, val * s)
-            )
-            self.sliders[param] = slider
+        # Create sliders in grid order
+        slider_artists = self._init_sliders([gs[1, 0], gs[1, 1], gs[2, 0], gs[2, 1]])
 
         # Add info text box
-        self.info_text = self.fig.add_subplot(gs[3, :])
-        self.info_text.axis('off')
-        self.info_box = self.info_text.text(
-            0.5, 0.5, self.get_info_string(),
+        self.ax_info = self.fig.add_subplot(gs[3, :])
+        self.ax_info.axis('off')
+        self._last_info = self.get_info_string()
+        self.info_artist = self.ax_info.text(
+            0.5, 0.5, self._last_info,
             ha='center', va='center',
             fontsize=11,
             bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8),
-            transform=self.info_text.transAxes
+            transform=self.ax_info.transAxes,
+            animated=True
         )
 
+        self._init_blitting([self.line_temp, self.line_power_e,
+                             self.line_power_t, self.info_artist] + slider_artists)
+
         plt.suptitle('SMR Power Plant - Interactive Dashboard\n' +
                     'Adjust parameters using sliders below',
                     y=0.98, fontsize=14, fontweight='bold')
 
-    def update_parameter(self, param_name, value):
-        """Update a parameter and re-simulate."""
-        print(f"\nUpdating {param_name} = {value:.2e}")
-        self.current_params[param_name] = value
-
-        # Re-simulate
-        try:
-            self.simulate()
-
-            # Update plots
-            self.line_temp.set_ydata(self.T_core - 273.15)
-            self.line_power_e.set_ydata(self.P_electric / 1e6)
-            self.line_power_t.set_ydata(self.Q_transfer / 1e6)
-
-            # Update y-axis limits
-            temp_margin = 5
-            self.ax_temp.set_ylim(
-                (self.T_core - 273.15).min() - temp_margin,
-                (self.T_core - 273.15).max() + temp_margin
-            )
-
-            power_data = np.concatenate([self.P_electric, self.Q_transfer]) / 1e6
-            power_margin = power_data.max() * 0.1
-            self.ax_power.set_ylim(
-                0, power_data.max() + power_margin
-            )
+    def _update_plot(self):
+        """Update the lines; returns True if a y-axis limit changed."""
+        self.line_temp.set_ydata(self.T_core_C)
+        self.line_power_e.set_ydata(self.P_electric_MW)
+        self.line_power_t.set_ydata(self.Q_transfer_MW)
 
-            # Update info text
-            self.info_box.set_text(self.get_info_string())
+        temp_changed = fit_ylim(self.ax_temp, self.T_core_C.min(), self.T_core_C.max())
 
-            self.fig.canvas.draw_idle()
+        pmax = max(self.P_electric_MW.max(), self.Q_transfer_MW.max())
+        power_changed = fit_ylim(self.ax_power, 0, pmax, bottom=0)
 
-        except Exception as e:
-            print(f"Error during simulation: {e}")
-            import traceback
-            traceback.print_exc()
+        return temp_changed or power_changed
 
     def get_info_string(self):
         """Generate info string with current parameters and results."""
-        final_temp = self.T_core[-1] - 273.15
-        final_power = self.P_electric[-1] / 1e6
-        final_heat = self.Q_transfer[-1] / 1e6
+        final_temp = self.T_core_C[-1]
+        final_power = self.P_electric_MW[-1]
+        final_heat = self.Q_transfer_MW[-1]
         actual_eff = (self.P_electric[-1] / self.current_params['Q_fission']) * 100
 
-        info = (
-            f"Parameters: Q_fission={self.current_params['Q_fission']/1e6:.1f} MW, "
-            f"η={self.current_params['eff_thermal']:.2f}, "
-            f"UA={self.current_params['UA']/1e3:.1f} kW/K, "
-            f"m={self.current_params['m_coolant']:.0f} kg\n"
-            f"Steady State: T_core={final_temp:.1f}°C, "
-            f"P_electric={final_power:.1f} MW, "
-            f"Q_transfer={final_heat:.1f} MW, "
-            f"Efficiency={actual_eff:.1f}%"
-        )
-        return info
-
-    def show(self):
-        """Display the interactive plot."""
-        plt.show()
+        return INFO_TEMPLATE.format_map(dict(
+            self.current_params,
+            Q_fission_MW=self.current_params['Q_fission'] / 1e6,
+            UA_kW=self.current_params['UA'] / 1e3,
+            final_temp=final_temp,
+            final_power=final_power,
+            final_heat=final_heat,
+            actual_eff=actual_eff,
+        ))
 
 
 def main():
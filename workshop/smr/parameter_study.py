@@ -4,108 +4,219 @@ Parameter study for SMR Power Plant model.
 Analyzes the effect of different parameters on reactor performance.
 """
 
+import argparse
+import contextlib
+import functools
+import multiprocessing
+import os
 import sys
 import pathlib
-import matplotlib.pyplot as plt
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+from _kernels import variations
+from _simcache import load_cached
+from common import (MODEL_FILE, MODEL_NAME, decimate, get_baseline, save_figure,
+                    simulate_smr, simulation_options)
 
-from OMPython import ModelicaSystem
 
+def _simulate_one(args):
+    """
+    Simulate the model with a single parameter value.
+
+    Runs in a worker process of the pool passed to run_parameter_sweep();
+    every process simulates its own model instance (see common.get_model()),
+    built in its own temporary directory, so parallel simulations do not
+    interfere. The result is also written to the disk cache (see _simcache).
+
+    Args:
+        args: Tuple (model_file, model_name, param_name, value, sim_time)
 
-def run_parameter_sweep(model_file, model_name, param_name, param_values, sim_time=1000):
+    Returns:
+        Results dictionary
+    """
+    model_file, model_name, param_name, value, sim_time = args
+    print(f"  Simulating with {param_name}={value}...")
+
+    results, _ = simulate_smr(model_file, model_name, sim_time, {param_name: str(value)})
+    return results
+
+
+def run_parameter_sweep(model_file, model_name, param_name, param_values, sim_time=1000,
+                        executor=None, baseline=None):
     """
     Run simulations with different parameter values.
 
+    Values found in the disk cache are loaded here; only the others are
+    simulated, on the given process pool. Only param_name changes between
+    runs, so each worker builds the model once and applies every value of
+    this and later sweeps through setParameters().
+
+    Args:
+        model_file: Path to the .mo file
+        model_name: Name of the model class
+        param_name: Name of the parameter to vary
+        param_values: Values of the parameter to simulate
+        sim_time: Simulation stop time
+        executor: Process pool running the simulations (default: run them
+            in this process)
+        baseline: (results, all_params) of the same model and sim_time with
+            default parameters, e.g. from get_baseline(); values equal to the
+            default reuse it instead of simulating again
+
     Returns:
-        List of results dictionaries
+        List of results dictionaries, in the order of param_values
     """
-    results_list = []
-
+    options = simulation_options(sim_time)
+    default = None
+    if baseline is not None:
+        baseline_results, defaults = baseline
+        default = float(defaults[param_name])
+
+    # results dict or Future per value
+    runs = []
     for value in param_values:
-        print(f"  Simulating with {param_name}={value}...")
-
-        mod = ModelicaSystem(
-            fileName=str(model_file),
-            modelName=model_name,
-            build=True
-        )
-
-        mod.setSimulationOptions({
-            'stopTime': str(sim_time),
-            'stepSize': '1.0'
-        })
-
-        mod.setParameters({param_name: str(value)})
-        mod.simulate()
-
-        results = {
-            'param_value': value,
-            'time': mod.getSolutions("time")[0],
-            'T_core': mod.getSolutions("T_core")[0],
-            'Q_transfer': mod.getSolutions("Q_transfer")[0],
-            'P_electric': mod.getSolutions("P_electric")[0],
-        }
+        if float(value) == default:
+            runs.append(baseline_results)
+            continue
+
+        cached = load_cached(model_file, model_name, options, {param_name: str(value)})
+        if cached is not None:
+            runs.append(cached[0])
+            continue
+
+        task = (model_file, model_name, param_name, value, sim_time)
+        runs.append(executor.submit(_simulate_one, task) if executor is not None
+                    else _simulate_one(task))
 
+    results_list = []
+    for value, results in zip(param_values, runs):
+        if isinstance(results, Future):
+            results = results.result()
+        results = dict(results, param_value=value)
+        print(f"  {param_name}={value}: final power {results['P_electric'][-1]/1e6:.2f} MW")
         results_list.append(results)
-        print(f"    Final power: {results['P_electric'][-1]/1e6:.2f} MW")
 
     return results_list
 
 
-def plot_parameter_study(param_name, param_label, results_list, output_file):
-    """Create visualization for parameter study results."""
+def _final_values(results_list, key):
+    """Return the last sample of results[key] of every run as an array."""
+    return np.fromiter((r[key][-1] for r in results_list),
+                       dtype=np.float64, count=len(results_list))
+
+
+def _plot_runs(ax, results_list, curves, colors):
+    """Draw the curve of every run over its time as a single LineCollection."""
+    from matplotlib.collections import LineCollection
+
+    segments = [np.column_stack(decimate(r['time'], y)) for r, y in zip(results_list, curves)]
+    lines = LineCollection(segments, colors=colors, linewidths=2,
+                           rasterized=True)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
+
+
+@functools.lru_cache(maxsize=32)
+def _viridis(n):
+    """Return n colors evenly spaced over the viridis colormap (read-only, cached)."""
+    import matplotlib.pyplot as plt
+
+    colors = plt.cm.viridis(np.linspace(0, 1, n))
+    colors.flags.writeable = False
+    return colors
+
 
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+# Figures of plot_parameter_study(), keyed by (nrows, ncols, figsize) and
+# cleared for every plot instead of allocating a new figure per study
+_figures = {}
+
+
+def _get_figure(nrows, ncols, figsize):
+    """Return an empty figure with a new nrows x ncols grid of axes."""
+    import matplotlib.pyplot as plt
+
+    key = (nrows, ncols, figsize)
+    fig = _figures.get(key)
+    if fig is None:
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize)
+        _figures[key] = fig
+    else:
+        # drops the artists of the previous plot together with their data
+        fig.clear()
+        axes = fig.subplots(nrows, ncols)
+    return fig, axes
+
+
+def close_figures():
+    """Close the figures reused by plot_parameter_study()."""
+    import matplotlib.pyplot as plt
+
+    for fig in _figures.values():
+        plt.close(fig)
+    _figures.clear()
+
+
+def plot_parameter_study(param_name, param_label, results_list):
+    """
+    Create visualization for parameter study results.
+
+    Returns the figure, which stays open and is reused by the next call
+    until close_figures().
+    """
+    from matplotlib.lines import Line2D
+
+    fig, axes = _get_figure(2, 2, (14, 10))
     fig.suptitle(f'SMR Parameter Study: {param_label}',
                  fontsize=16, fontweight='bold')
 
     # Color map for different parameter values
-    colors = plt.cm.viridis(np.linspace(0, 1, len(results_list)))
+    colors = _viridis(len(results_list))
+
+    # Convert every run to °C and MW once, for the panels below
+    converted = [{
+        'T_C': r['T_core'] - 273.15,
+        'Q_MW': r['Q_transfer'] * 1e-6,
+        'P_MW': r['P_electric'] * 1e-6,
+    } for r in results_list]
+
+    # One legend entry per run, shared by the three time-series panels
+    handles = [Line2D([], [], color=color, linewidth=2) for color in colors]
+    labels = [f'{param_name}={r["param_value"]}' for r in results_list]
 
     # Panel 1: Core Temperature
     ax1 = axes[0, 0]
-    for result, color in zip(results_list, colors):
-        label = f'{param_name}={result["param_value"]}'
-        ax1.plot(result['time'], result['T_core'] - 273.15,
-                color=color, linewidth=2, label=label)
+    _plot_runs(ax1, results_list, [conv['T_C'] for conv in converted], colors)
     ax1.set_xlabel('Time (s)')
     ax1.set_ylabel('Core Temperature (°C)')
     ax1.set_title('Core Temperature Evolution')
-    ax1.legend()
+    ax1.legend(handles, labels)
     ax1.grid(True, alpha=0.3)
 
     # Panel 2: Heat Transfer
     ax2 = axes[0, 1]
-    for result, color in zip(results_list, colors):
-        label = f'{param_name}={result["param_value"]}'
-        ax2.plot(result['time'], result['Q_transfer'] / 1e6,
-                color=color, linewidth=2, label=label)
+    _plot_runs(ax2, results_list, [conv['Q_MW'] for conv in converted], colors)
     ax2.set_xlabel('Time (s)')
     ax2.set_ylabel('Heat Transfer (MW)')
     ax2.set_title('Heat Transfer Rate')
-    ax2.legend()
+    ax2.legend(handles, labels)
     ax2.grid(True, alpha=0.3)
 
     # Panel 3: Electric Power
     ax3 = axes[1, 0]
-    for result, color in zip(results_list, colors):
-        label = f'{param_name}={result["param_value"]}'
-        ax3.plot(result['time'], result['P_electric'] / 1e6,
-                color=color, linewidth=2, label=label)
+    _plot_runs(ax3, results_list, [conv['P_MW'] for conv in converted], colors)
     ax3.set_xlabel('Time (s)')
     ax3.set_ylabel('Electric Power (MW)')
     ax3.set_title('Electric Power Output')
-    ax3.legend()
+    ax3.legend(handles, labels)
     ax3.grid(True, alpha=0.3)
 
     # Panel 4: Summary comparison (steady-state values)
     ax4 = axes[1, 1]
     param_vals = [r['param_value'] for r in results_list]
-    final_temps = [r['T_core'][-1] - 273.15 for r in results_list]
-    final_powers = [r['P_electric'][-1] / 1e6 for r in results_list]
+    final_temps = _final_values(converted, 'T_C')
+    final_powers = _final_values(converted, 'P_MW')
 
     ax4_twin = ax4.twinx()
 
@@ -127,38 +238,29 @@ def plot_parameter_study(param_name, param_label, results_list, output_file):
     labels = [l.get_label() for l in lines]
     ax4.legend(lines, labels, loc='upper left')
 
-    plt.tight_layout()
+    fig.tight_layout()
+    return fig
 
-    output_file.parent.mkdir(exist_ok=True)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"  ✓ Saved: {output_file}")
-    plt.close()
 
-
-def create_sensitivity_analysis(all_studies, output_file):
-    """Create sensitivity analysis comparing all parameter studies."""
+def create_sensitivity_analysis(all_studies):
+    """Create sensitivity analysis comparing all parameter studies; returns the figure."""
+    import matplotlib.pyplot as plt
 
     fig, axes = plt.subplots(2, 1, figsize=(12, 10))
     fig.suptitle('SMR Parameter Sensitivity Analysis',
                  fontsize=16, fontweight='bold')
 
-    # Prepare data for sensitivity plot
-    param_names = []
-    power_variations = []
-    temp_variations = []
-
-    for param_name, results_list in all_studies.items():
-        param_names.append(param_name)
+    # Prepare data for sensitivity plot: the final values of all runs in one
+    # array, study i covering runs[offsets[i]:offsets[i + 1]]
+    param_names = list(all_studies)
+    runs = [r for results_list in all_studies.values() for r in results_list]
+    offsets = np.zeros(len(all_studies) + 1, dtype=np.int64)
+    np.cumsum([len(results_list) for results_list in all_studies.values()],
+              out=offsets[1:])
 
-        # Calculate variation (max - min) / mean
-        powers = [r['P_electric'][-1] for r in results_list]
-        temps = [r['T_core'][-1] for r in results_list]
-
-        power_var = (max(powers) - min(powers)) / np.mean(powers) * 100
-        temp_var = (max(temps) - min(temps)) / np.mean(temps) * 100
-
-        power_variations.append(power_var)
-        temp_variations.append(temp_var)
+    # Calculate variation (max - min) / mean
+    power_variations = variations(_final_values(runs, 'P_electric'), offsets)
+    temp_variations = variations(_final_values(runs, 'T_core'), offsets)
 
     # Panel 1: Power output sensitivity
     ax1 = axes[0]
@@ -169,10 +271,7 @@ def create_sensitivity_analysis(all_studies, output_file):
     ax1.grid(True, alpha=0.3, axis='y')
 
     # Add value labels on bars
-    for bar, val in zip(bars1, power_variations):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'{val:.1f}%', ha='center', va='bottom', fontweight='bold')
+    ax1.bar_label(bars1, fmt='%.1f%%', fontweight='bold')
 
     # Panel 2: Core temperature sensitivity
     ax2 = axes[1]
@@ -184,29 +283,30 @@ def create_sensitivity_analysis(all_studies, output_file):
     ax2.grid(True, alpha=0.3, axis='y')
 
     # Add value labels on bars
-    for bar, val in zip(bars2, temp_variations):
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height,
-                f'{val:.1f}%', ha='center', va='bottom', fontweight='bold')
+    ax2.bar_label(bars2, fmt='%.1f%%', fontweight='bold')
 
-    plt.tight_layout()
-    output_file.parent.mkdir(exist_ok=True)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"  ✓ Saved: {output_file}")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
-def main():
+def main(argv=None):
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="SMR Power Plant parameter study")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes, shared by all sweeps; '
+                             '1 runs them in-process with a single model build')
+    args = parser.parse_args(argv)
+
+    # batch run: render the PNG files without a GUI backend
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    plt.ioff()
 
     print("=" * 70)
     print("SMR Power Plant - Parameter Study")
     print("=" * 70)
 
     # Define paths
-    project_dir = pathlib.Path(__file__).parent.parent.parent
-    model_file = project_dir / "mo_example" / "srm.mo"
-    model_name = "SMR_PowerPlant"
     output_dir = pathlib.Path(__file__).parent / "results"
 
     # Define parameter studies
@@ -226,32 +326,66 @@ def main():
     }
 
     try:
-        all_results = {}
+        # Every study contains the default value of its parameter, which is
+        # the baseline simulation shared with the other SMR scripts
+        print("\nRunning baseline simulation...")
+        baseline = get_baseline(sim_time=1000)
 
-        for i, (param_name, study_config) in enumerate(studies.items(), 1):
-            print(f"\n[{i}/{len(studies)}] Parameter study: {param_name}")
-            print("=" * 70)
-
-            results_list = run_parameter_sweep(
-                model_file, model_name,
-                param_name, study_config['values'],
-                sim_time=1000
-            )
-
-            all_results[param_name] = results_list
-
-            print(f"\n  Creating plots for {param_name}...")
-            plot_parameter_study(
-                param_name, study_config['label'],
-                results_list,
-                output_dir / f"param_study_{param_name}.png"
-            )
-
-        print(f"\n[{len(studies)+1}/{len(studies)+1}] Creating sensitivity analysis...")
-        create_sensitivity_analysis(
-            all_results,
-            output_dir / "sensitivity_analysis.png"
-        )
+        all_results = {}
+        # The PNG files are written in the background while the next sweep
+        # runs
+        saves = []
+
+        # One process pool for all sweeps, so that every worker builds the
+        # model once and reuses it for the later studies
+        max_workers = args.workers or min(
+            max(len(study_config['values']) for study_config in studies.values()),
+            os.cpu_count() or 1)
+        if max_workers > 1:
+            # spawn: forking while the figure-saving thread runs could
+            # deadlock the workers
+            pool = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+        else:
+            pool = contextlib.nullcontext()
+
+        with pool as sim_executor, ThreadPoolExecutor(max_workers=2) as executor:
+            for i, (param_name, study_config) in enumerate(studies.items(), 1):
+                print(f"\n[{i}/{len(studies)}] Parameter study: {param_name}")
+                print("=" * 70)
+
+                results_list = run_parameter_sweep(
+                    MODEL_FILE, MODEL_NAME,
+                    param_name, study_config['values'],
+                    sim_time=1000,
+                    executor=sim_executor,
+                    baseline=baseline
+                )
+
+                all_results[param_name] = results_list
+
+                # plot_parameter_study() reuses its figure, so the previous
+                # study has to be saved before it is drawn again
+                if saves:
+                    saves[-1].result()
+
+                print(f"\n  Creating plots for {param_name}...")
+                fig = plot_parameter_study(
+                    param_name, study_config['label'],
+                    results_list
+                )
+                saves.append(executor.submit(
+                    save_figure, fig, output_dir / f"param_study_{param_name}.png"))
+
+            print(f"\n[{len(studies)+1}/{len(studies)+1}] Creating sensitivity analysis...")
+            fig = create_sensitivity_analysis(all_results)
+            saves.append(executor.submit(
+                save_figure, fig, output_dir / "sensitivity_analysis.png"))
+
+        for future in saves:
+            future.result()
+        plt.close(fig)
+        close_figures()
 
         print("\n" + "=" * 70)
         print("✓ All parameter studies completed successfully!")
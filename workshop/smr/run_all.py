@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Run all SMR Power Plant workshop scripts in one process.
+The basic test builds and simulates the baseline model; the visualization
+and the parameter study reuse its result.
+"""
+
+import argparse
+import sys
+
+import parameter_study
+import test_basic
+import visualize_smr
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Run all SMR Power Plant scripts")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes of the parameter study')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SMR Power Plant - All Workshop Scripts")
+    print("=" * 70)
+
+    if test_basic.main() != 0:
+        return 1
+
+    visualize_smr.main()
+
+    study_args = [] if args.workers is None else ['--workers', str(args.workers)]
+    parameter_study.main(study_args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
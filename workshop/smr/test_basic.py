@@ -5,12 +5,8 @@ Tests model loading, simulation, and basic output verification.
 """
 
 import sys
-import pathlib
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
-
-from OMPython import ModelicaSystem
+from common import MODEL_FILE, MODEL_NAME, simulate_smr
 
 
 def main():
@@ -18,50 +14,31 @@ def main():
     print("SMR Power Plant Model - Basic Test")
     print("=" * 70)
 
-    # Define paths
-    project_dir = pathlib.Path(__file__).parent.parent.parent
-    model_file = project_dir / "mo_example" / "srm.mo"
-    model_name = "SMR_PowerPlant"
-
-    print(f"\nModel file: {model_file}")
-    print(f"Model exists: {model_file.exists()}")
-    print(f"Model name: {model_name}")
+    print(f"\nModel file: {MODEL_FILE}")
+    print(f"Model exists: {MODEL_FILE.exists()}")
+    print(f"Model name: {MODEL_NAME}")
 
     try:
-        print("\n[1/5] Loading SMR model...")
-        mod = ModelicaSystem(
-            fileName=str(model_file),
-            modelName=model_name,
-            build=True
-        )
-        print("  ✓ Model loaded successfully")
-
-        print("\n[2/5] Checking parameters...")
-        params = mod.getParameters()
+        # Bypass the result caches: the test has to exercise OMC. The fresh
+        # result replaces the cached baseline of the other SMR scripts
+        print("\n[1/3] Building and simulating SMR model...")
+        results, params = simulate_smr(MODEL_FILE, MODEL_NAME, sim_time=1000,
+                                       use_cache=False)
+        print("  ✓ Simulation completed")
+
+        print("\n[2/3] Checking parameters...")
         print(f"  Found {len(params)} parameters:")
         for name, value in params.items():
             print(f"    {name}: {value}")
 
-        print("\n[3/5] Setting simulation options...")
-        mod.setSimulationOptions({
-            'stopTime': '1000',  # 1000 seconds simulation
-            'stepSize': '1.0',
-            'tolerance': '1e-6'
-        })
-        print("  ✓ Simulation options set")
-
-        print("\n[4/5] Running simulation...")
-        mod.simulate()
-        print("  ✓ Simulation completed")
-
-        print("\n[5/5] Extracting and analyzing results...")
+        print("\n[3/3] Extracting and analyzing results...")
         print("=" * 70)
 
         # Get results
-        time = mod.getSolutions("time")[0]
-        T_core = mod.getSolutions("T_core")[0]
-        Q_transfer = mod.getSolutions("Q_transfer")[0]
-        P_electric = mod.getSolutions("P_electric")[0]
+        time = results['time']
+        T_core = results['T_core']
+        Q_transfer = results['Q_transfer']
+        P_electric = results['P_electric']
 
         print(f"\nSimulation statistics:")
         print(f"  Time points: {len(time)}")
@@ -6,50 +6,20 @@ Creates multiple plots showing different aspects of reactor operation.
 
 import sys
 import pathlib
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
-# Add parent directory to path
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.parent))
+from common import MODEL_FILE, MODEL_NAME, decimate, get_baseline, save_figure
 
-from OMPython import ModelicaSystem
 
+def _numeric_params(params, keys=('Q_fission', 'T_steam', 'eff_thermal')):
+    """Parse the plotted parameters of getParameters() to floats once."""
+    return {key: float(params[key]) for key in keys if key in params}
 
-def simulate_smr(model_file, model_name, sim_time=1000, params=None):
-    """Run SMR simulation with optional parameter overrides."""
-    mod = ModelicaSystem(
-        fileName=str(model_file),
-        modelName=model_name,
-        build=True
-    )
 
-    mod.setSimulationOptions({
-        'stopTime': str(sim_time),
-        'stepSize': '1.0',
-        'tolerance': '1e-6'
-    })
-
-    if params:
-        mod.setParameters(params)
-
-    mod.simulate()
-
-    # Extract results
-    results = {
-        'time': mod.getSolutions("time")[0],
-        'T_core': mod.getSolutions("T_core")[0],
-        'Q_transfer': mod.getSolutions("Q_transfer")[0],
-        'P_electric': mod.getSolutions("P_electric")[0],
-    }
-
-    # Get parameters
-    all_params = mod.getParameters()
-
-    return results, all_params
-
-
-def create_comprehensive_plot(results, params, output_file):
-    """Create a comprehensive 4-panel plot of SMR operation."""
+def create_comprehensive_plot(results, params):
+    """Create a comprehensive 4-panel plot of SMR operation; returns the figure."""
+    import matplotlib.pyplot as plt
 
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     fig.suptitle('SMR Power Plant - Comprehensive Analysis',
@@ -60,11 +30,19 @@ def create_comprehensive_plot(results, params, output_file):
     Q_transfer = results['Q_transfer']
     P_electric = results['P_electric']
 
+    # Convert to °C and MW once
+    T_C = T_core - 273.15
+    Q_MW = Q_transfer * 1e-6
+    P_MW = P_electric * 1e-6
+    values = _numeric_params(params)
+
     # Panel 1: Core Temperature
     ax1 = axes[0, 0]
-    ax1.plot(time, T_core - 273.15, 'r-', linewidth=2, label='Core Temperature')
-    ax1.axhline(y=float(params['T_steam'])-273.15, color='b',
-                linestyle='--', label=f'Steam Temp ({float(params["T_steam"])-273.15:.0f}°C)')
+    ax1.plot(*decimate(time, T_C), 'r-', linewidth=2, label='Core Temperature',
+             rasterized=True)
+    T_steam_C = values['T_steam'] - 273.15
+    ax1.axhline(y=T_steam_C, color='b',
+                linestyle='--', label=f'Steam Temp ({T_steam_C:.0f}°C)')
     ax1.set_xlabel('Time (s)', fontsize=11)
     ax1.set_ylabel('Temperature (°C)', fontsize=11)
     ax1.set_title('Core Coolant Temperature', fontweight='bold')
@@ -73,9 +51,10 @@ def create_comprehensive_plot(results, params, output_file):
 
     # Panel 2: Heat Transfer
     ax2 = axes[0, 1]
-    ax2.plot(time, Q_transfer / 1e6, 'g-', linewidth=2)
-    ax2.axhline(y=float(params['Q_fission'])/1e6, color='orange',
-                linestyle='--', label=f'Fission Power ({float(params["Q_fission"])/1e6:.0f} MW)')
+    ax2.plot(*decimate(time, Q_MW), 'g-', linewidth=2, rasterized=True)
+    Q_fission_MW = values['Q_fission'] * 1e-6
+    ax2.axhline(y=Q_fission_MW, color='orange',
+                linestyle='--', label=f'Fission Power ({Q_fission_MW:.0f} MW)')
     ax2.set_xlabel('Time (s)', fontsize=11)
     ax2.set_ylabel('Heat Transfer (MW)', fontsize=11)
     ax2.set_title('Heat Transfer Rate', fontweight='bold')
@@ -84,8 +63,8 @@ def create_comprehensive_plot(results, params, output_file):
 
     # Panel 3: Electric Power Output
     ax3 = axes[1, 0]
-    ax3.plot(time, P_electric / 1e6, 'b-', linewidth=2)
-    avg_power = P_electric.mean() / 1e6
+    ax3.plot(*decimate(time, P_MW), 'b-', linewidth=2, rasterized=True)
+    avg_power = P_MW.mean()
     ax3.axhline(y=avg_power, color='r', linestyle='--',
                 label=f'Average ({avg_power:.1f} MW)')
     ax3.set_xlabel('Time (s)', fontsize=11)
@@ -96,10 +75,9 @@ def create_comprehensive_plot(results, params, output_file):
 
     # Panel 4: Efficiency over time
     ax4 = axes[1, 1]
-    Q_fission = float(params['Q_fission'])
-    efficiency = (P_electric / Q_fission) * 100
-    ax4.plot(time, efficiency, 'purple', linewidth=2)
-    nominal_eff = float(params['eff_thermal']) * 100
+    efficiency = (P_electric / values['Q_fission']) * 100
+    ax4.plot(*decimate(time, efficiency), 'purple', linewidth=2, rasterized=True)
+    nominal_eff = values['eff_thermal'] * 100
     ax4.axhline(y=nominal_eff, color='orange', linestyle='--',
                 label=f'Nominal ({nominal_eff:.1f}%)')
     ax4.set_xlabel('Time (s)', fontsize=11)
@@ -108,21 +86,18 @@ def create_comprehensive_plot(results, params, output_file):
     ax4.legend()
     ax4.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-
-    output_file.parent.mkdir(exist_ok=True)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"  ✓ Saved: {output_file}")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
-def create_energy_flow_diagram(results, params, output_file):
-    """Create Sankey-style energy flow diagram."""
+def create_energy_flow_diagram(results, params):
+    """Create Sankey-style energy flow diagram; returns the figure."""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots(figsize=(12, 8))
 
     # Get final steady-state values
-    Q_fission = float(params['Q_fission']) / 1e6  # MW
+    Q_fission = _numeric_params(params)['Q_fission'] * 1e-6  # MW
     Q_transfer_final = results['Q_transfer'][-1] / 1e6  # MW
     P_electric_final = results['P_electric'][-1] / 1e6  # MW
     Q_loss = Q_fission - Q_transfer_final  # Heat loss in core
@@ -136,11 +111,7 @@ def create_energy_flow_diagram(results, params, output_file):
     bars = ax.bar(stages, values, color=colors, alpha=0.7, edgecolor='black', linewidth=2)
 
     # Add value labels on bars
-    for bar, val in zip(bars, values):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{val:.1f} MW',
-                ha='center', va='bottom', fontsize=12, fontweight='bold')
+    ax.bar_label(bars, fmt='%.1f MW', fontsize=12, fontweight='bold')
 
     # Add loss annotations
     ax.annotate(f'Core Loss\n{Q_loss:.1f} MW',
@@ -162,15 +133,13 @@ def create_energy_flow_diagram(results, params, output_file):
             fontsize=12, ha='center', va='top',
             bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
 
-    plt.tight_layout()
-    output_file.parent.mkdir(exist_ok=True)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"  ✓ Saved: {output_file}")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
-def create_transient_analysis(results, params, output_file):
-    """Create detailed transient analysis plot."""
+def create_transient_analysis(results, params):
+    """Create detailed transient analysis plot; returns the figure."""
+    import matplotlib.pyplot as plt
 
     fig, axes = plt.subplots(3, 1, figsize=(12, 10))
     fig.suptitle('SMR Transient Response Analysis',
@@ -181,20 +150,24 @@ def create_transient_analysis(results, params, output_file):
     Q_transfer = results['Q_transfer']
     P_electric = results['P_electric']
 
-    # Calculate derivatives (rate of change)
-    dt = np.diff(time)
-    dT_dt = np.diff(T_core) / dt
-    dQ_dt = np.diff(Q_transfer) / dt
-    dP_dt = np.diff(P_electric) / dt
+    # Convert to °C and MW once
+    T_C = T_core - 273.15
+    Q_MW = Q_transfer * 1e-6
+    P_MW = P_electric * 1e-6
+    values = _numeric_params(params)
+
+    # Calculate rate of change of the core temperature
+    dT_dt = np.diff(T_core) / np.diff(time)
     time_diff = time[:-1]
 
     # Panel 1: Temperature and its rate of change
     ax1 = axes[0]
     ax1_twin = ax1.twinx()
 
-    l1 = ax1.plot(time, T_core - 273.15, 'r-', linewidth=2, label='Core Temp')
-    l2 = ax1_twin.plot(time_diff, dT_dt, 'b--', linewidth=1.5,
-                       alpha=0.7, label='Rate of Change')
+    l1 = ax1.plot(*decimate(time, T_C), 'r-', linewidth=2, label='Core Temp',
+                  rasterized=True)
+    l2 = ax1_twin.plot(*decimate(time_diff, dT_dt), 'b--', linewidth=1.5,
+                       alpha=0.7, label='Rate of Change', rasterized=True)
 
     ax1.set_xlabel('Time (s)', fontsize=11)
     ax1.set_ylabel('Temperature (°C)', fontsize=11, color='r')
@@ -211,9 +184,9 @@ def create_transient_analysis(results, params, output_file):
 
     # Panel 2: Heat transfer dynamics
     ax2 = axes[1]
-    ax2.plot(time, Q_transfer / 1e6, 'g-', linewidth=2, label='Heat Transfer')
-    Q_fission = float(params['Q_fission'])
-    ax2.axhline(y=Q_fission/1e6, color='orange', linestyle='--',
+    ax2.plot(*decimate(time, Q_MW), 'g-', linewidth=2, label='Heat Transfer',
+             rasterized=True)
+    ax2.axhline(y=values['Q_fission'] * 1e-6, color='orange', linestyle='--',
                 label='Fission Power')
 
     ax2.set_xlabel('Time (s)', fontsize=11)
@@ -224,18 +197,21 @@ def create_transient_analysis(results, params, output_file):
 
     # Panel 3: Power output settling
     ax3 = axes[2]
-    ax3.plot(time, P_electric / 1e6, 'b-', linewidth=2, label='Electric Power')
+    ax3.plot(*decimate(time, P_MW), 'b-', linewidth=2, label='Electric Power',
+             rasterized=True)
 
-    # Calculate settling time (when within 2% of final value)
+    # Calculate settling time (when within 2% of final value): the power
+    # stays in the band after the last sample outside of it
     final_power = P_electric[-1]
     tolerance = 0.02 * final_power
-    settled_mask = np.abs(P_electric - final_power) < tolerance
-    if np.any(settled_mask):
-        settling_time = time[np.argmax(settled_mask)]
+    outside = np.flatnonzero(np.abs(P_electric - final_power) >= tolerance)
+    settling_idx = outside[-1] + 1 if outside.size else 0
+    if settling_idx < len(time):
+        settling_time = time[settling_idx]
         ax3.axvline(x=settling_time, color='r', linestyle='--',
                    label=f'Settling Time: {settling_time:.1f}s')
-        ax3.axhline(y=final_power/1e6, color='orange', linestyle=':',
-                   alpha=0.5, label=f'Steady State: {final_power/1e6:.1f} MW')
+        ax3.axhline(y=P_MW[-1], color='orange', linestyle=':',
+                   alpha=0.5, label=f'Steady State: {P_MW[-1]:.1f} MW')
 
     ax3.set_xlabel('Time (s)', fontsize=11)
     ax3.set_ylabel('Electric Power (MW)', fontsize=11)
@@ -243,51 +219,50 @@ def create_transient_analysis(results, params, output_file):
     ax3.legend()
     ax3.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    output_file.parent.mkdir(exist_ok=True)
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"  ✓ Saved: {output_file}")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
 def main():
     """Main execution function."""
 
+    # batch run: render the PNG files without a GUI backend
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    plt.ioff()
+
     print("=" * 70)
     print("SMR Power Plant - Comprehensive Visualization")
     print("=" * 70)
 
     # Define paths
-    project_dir = pathlib.Path(__file__).parent.parent.parent
-    model_file = project_dir / "mo_example" / "srm.mo"
-    model_name = "SMR_PowerPlant"
     output_dir = pathlib.Path(__file__).parent / "results"
 
-    print(f"\nModel file: {model_file}")
-    print(f"Model name: {model_name}")
+    print(f"\nModel file: {MODEL_FILE}")
+    print(f"Model name: {MODEL_NAME}")
 
     try:
         print("\n[1/4] Running SMR simulation...")
-        results, params = simulate_smr(model_file, model_name, sim_time=1000)
+        results, params = get_baseline(sim_time=1000)
         print("  ✓ Simulation complete")
 
-        print("\n[2/4] Creating comprehensive plot...")
-        create_comprehensive_plot(
-            results, params,
-            output_dir / "smr_comprehensive.png"
-        )
-
-        print("\n[3/4] Creating energy flow diagram...")
-        create_energy_flow_diagram(
-            results, params,
-            output_dir / "smr_energy_flow.png"
-        )
-
-        print("\n[4/4] Creating transient analysis...")
-        create_transient_analysis(
-            results, params,
-            output_dir / "smr_transient.png"
-        )
+        # The PNG files are written in the background while the next figure
+        # is drawn
+        plots = [
+            ("comprehensive plot", create_comprehensive_plot, "smr_comprehensive.png"),
+            ("energy flow diagram", create_energy_flow_diagram, "smr_energy_flow.png"),
+            ("transient analysis", create_transient_analysis, "smr_transient.png"),
+        ]
+        saves = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for i, (title, create_plot, file_name) in enumerate(plots, 2):
+                print(f"\n[{i}/4] Creating {title}...")
+                fig = create_plot(results, params)
+                saves.append((fig, executor.submit(save_figure, fig, output_dir / file_name)))
+
+        for fig, future in saves:
+            future.result()
+            plt.close(fig)
 
         print("\n" + "=" * 70)
         print("✓ All visualizations completed successfully!")